@@ -31,6 +31,7 @@ import ctypes.util
 import gc
 import os
 import platform
+import re
 import resource
 import sys
 import threading
@@ -53,11 +54,26 @@ except ImportError:
     sys.exit(1)
 
 
+_CHUNK_RE = re.compile(r"^\s*(\d+)\s*([KMG]B?)?\s*$", re.IGNORECASE)
+
+
 class Jaws:
-    def __init__(self, percentage, static_mode, chunk_size_mb, intensity):
+    # Access-worker cycles between throughput recalibrations.
+    CALIBRATE_CYCLES = 10
+    # From this intensity, one worker pointer-chases instead (latency load).
+    CHASE_MIN_INTENSITY = 8
+    CHASE_BATCH = 1 << 10   # dependent loads between GIL yields (~0.1 ms)
+    CHASE_MIN_BYTES = 64 * 1024 * 1024  # smaller chains fit in LLC, not DRAM
+    CHASE_SPAN_BYTES = 4 * CHASE_MIN_BYTES  # cap on bytes linked into the chain
+    CHASE_SCATTER = 1 << 18  # chain links written per scatter slice
+    CACHE_LINE = 64         # one chain node per cache line
+
+    def __init__(self, percentage, static_mode, chunk_size_mb, intensity,
+                 hugepages=True):
         self.percentage = percentage
         self.static_mode = static_mode
         self.intensity = intensity  # 1-10 scale
+        self.hugepages = hugepages  # let numpy advise THP on large buffers
         self.chunk_size = int(chunk_size_mb * 1024 * 1024)
 
         self.buffers = []          # list of numpy uint8 arrays
@@ -66,6 +82,7 @@ class Jaws:
         self.page_size = resource.getpagesize()
 
         self.libc = self._load_libc()
+        self._proc = psutil.Process(os.getpid())  # reused by all reporting
 
         # Stop signalling for worker threads.
         self._stop = threading.Event()
@@ -84,10 +101,13 @@ class Jaws:
             self.chunk_size = self.page_size
 
         # Derive the per-cycle work profile from intensity (1-10).
-        # Higher intensity -> larger region touched per cycle and shorter sleep,
-        # which together drive higher sustained memory bandwidth.
+        # Each 0.2 s cycle is a busy phase followed by a sleep; intensity sets
+        # the busy share (10% .. 100%). work_fraction is only the initial
+        # region size: workers then calibrate the region to their measured
+        # throughput so the busy phase lasts busy_time on any hardware.
         self.work_fraction = min(1.0, 0.05 * self.intensity)        # 0.05 .. 0.50
         self.cycle_sleep = max(0.0, 0.20 - (self.intensity * 0.02))  # 0.18 .. 0.0
+        self.busy_time = 0.20 - self.cycle_sleep                     # 0.02 .. 0.20
 
     # -- setup helpers ----------------------------------------------------
 
@@ -106,6 +126,25 @@ class Jaws:
             print(f"Warning: Could not load libc ({e}); memory locking disabled.")
             return None
 
+    @staticmethod
+    def _set_numpy_hugepages(enabled):
+        """Toggle numpy's own MADV_HUGEPAGE advice; return False if unsupported.
+
+        numpy's allocator already madvise()s transparent huge pages onto every
+        allocation of 4 MB or more, so JAWS buffers get THP by default wherever
+        the kernel allows it. This hook (private numpy API, hence the guards)
+        is the only way to turn that off.
+        """
+        try:
+            from numpy._core import multiarray
+        except ImportError:  # numpy < 2.0
+            from numpy.core import multiarray
+        setter = getattr(multiarray, "_set_madvise_hugepage", None)
+        if setter is None:
+            return False
+        setter(enabled)
+        return True
+
     # -- allocation -------------------------------------------------------
 
     def create_buffer(self):
@@ -126,6 +165,9 @@ class Jaws:
             f"Allocating {self.target_bytes / (1024 * 1024):.2f} MB in up to "
             f"{num_chunks} chunk(s) of {self.chunk_size / (1024 * 1024):.2f} MB..."
         )
+        if not self.hugepages and not self._set_numpy_hugepages(False):
+            print("Warning: this numpy cannot disable huge-page advice; "
+                  "--no-hugepages ignored.")
 
         remaining = self.target_bytes
         i = 0
@@ -158,7 +200,6 @@ class Jaws:
         )
 
         self._touch_and_lock()
-        gc.collect()
 
     def _touch_and_lock(self):
         """Fault in every page (residency) and mlock each buffer (no swap)."""
@@ -183,32 +224,66 @@ class Jaws:
             f"Pages resident; locked {self.locked_bytes / (1024 * 1024):.2f} MB "
             f"of {self.allocated_bytes / (1024 * 1024):.2f} MB."
         )
+        huge_kb = self._anon_huge_kb()
+        if huge_kb is not None:
+            # AnonHugePages is process-wide, so this is an upper bound for the
+            # buffers' share, not a per-buffer measurement.
+            share = min(100.0, huge_kb * 1024 * 100.0 / max(1, self.allocated_bytes))
+            print(
+                f"Huge pages: {huge_kb / 1024:.2f} MB AnonHugePages process-wide, "
+                f"i.e. at most {share:.0f}% of the "
+                f"{self.allocated_bytes / (1024 * 1024):.2f} MB of buffers."
+            )
 
     # -- access engine ----------------------------------------------------
 
-    def _access_worker(self, wid):
+    def _access_worker(self, wid, buffers):
         """
         Vectorized read-modify-write over random regions.
 
         numpy releases the GIL during these bulk operations, so multiple worker
         threads genuinely run in parallel across cores and drive real memory
         bandwidth (unlike v1's per-byte Python loops).
+
+        The bytes processed per cycle are recalibrated from this thread's
+        measured bytes/s (first after one cycle, then every CALIBRATE_CYCLES)
+        so each busy phase lasts busy_time; a budget larger than one buffer
+        is spread over several random regions. A fixed size would be pure
+        sleep on fast DRAM and overrun the cycle on slow or contended systems.
         """
         # Per-thread RNG state; offset the seed so threads diverge.
         state = np.random.default_rng(wid + 1)
         checksum = np.uint64(0)
+        budget = None  # calibrated bytes per cycle; None until first sample
+        done_bytes, busy, cycles, calibrate_at = 0, 0.0, 0, 1
         try:
             while not self._stop.is_set():
-                buf = self.buffers[state.integers(0, len(self.buffers))]
-                n = buf.shape[0]
-                span = max(self.page_size, int(n * self.work_fraction))
-                span = min(span, n)
-                start = 0 if span >= n else int(state.integers(0, n - span + 1))
-                region = buf[start:start + span]
-
-                # Write pass (RMW) and read pass (reduction) over the region.
-                region += 1
-                checksum ^= np.uint64(region[:: self.page_size].sum(dtype=np.uint64))
+                t0 = time.perf_counter()
+                remaining = budget
+                while not self._stop.is_set():
+                    buf = buffers[state.integers(0, len(buffers))]
+                    n = buf.shape[0]
+                    span = int(n * self.work_fraction) if remaining is None else remaining
+                    span = min(max(self.page_size, span), n)
+                    start = 0 if span >= n else int(state.integers(0, n - span + 1))
+                    region = buf[start:start + span]
+
+                    # Write pass (RMW) and read pass (reduction) over the region.
+                    # The read covers every byte: a one-byte-per-page stride
+                    # still pulls a 64-byte line per page and wastes 63/64 of it.
+                    region += 1
+                    checksum ^= np.uint64(region.sum(dtype=np.uint64))
+                    done_bytes += span
+                    if remaining is None or remaining <= span:
+                        break
+                    remaining -= span
+                busy += time.perf_counter() - t0
+                cycles += 1
+
+                if cycles >= calibrate_at and busy > 0:
+                    budget = int(done_bytes / busy * self.busy_time)
+                    done_bytes, busy, cycles = 0, 0.0, 0
+                    calibrate_at = self.CALIBRATE_CYCLES
 
                 if self.cycle_sleep:
                     self._stop.wait(self.cycle_sleep)
@@ -217,6 +292,59 @@ class Jaws:
         except Exception as e:
             print(f"Error in access worker {wid}: {e}")
 
+    def _build_chain(self, buf):
+        """Link buf's cache lines into one random cycle; return the int64 view.
+
+        Slot 8*k (the first 8 bytes of line k) holds the slot index of the next
+        line, visiting every line once in a random order, so each load depends
+        on the previous one and hardware prefetch cannot guess the next.
+
+        Only the first CHASE_SPAN_BYTES are linked (still far beyond any LLC),
+        so the transient permutation is bounded whatever --chunk is: int32 and
+        shuffled in place, 1/16 of the span (16 MB), plus a small per-slice
+        index copy during the scatter.
+        """
+        lines = min(buf.nbytes, self.CHASE_SPAN_BYTES) // self.CACHE_LINE
+        stride = self.CACHE_LINE // 8  # line index -> int64 slot index
+        dtype = np.int32 if lines * stride < 2 ** 31 else np.int64
+        order = np.arange(0, lines * stride, stride, dtype=dtype)
+        np.random.default_rng().shuffle(order)
+        chain = buf.view(np.int64)
+        # Scatter in slices: numpy converts fancy indices to intp, and doing
+        # it whole would copy the full permutation again.
+        for k in range(0, lines - 1, self.CHASE_SCATTER):
+            end = min(k + self.CHASE_SCATTER, lines - 1)
+            chain[order[k:end]] = order[k + 1:end + 1]
+        chain[order[-1]] = order[0]
+        return chain
+
+    def _chase_worker(self, chain):
+        """
+        Dependent random loads (pointer chasing) over a randomly linked buffer.
+
+        The RMW workers issue independent accesses that the CPU overlaps, so
+        they measure bandwidth; here each address comes from the previous load,
+        so every step pays full memory latency. The chase itself runs in the
+        interpreter and holds the GIL, so it yields after every CHASE_BATCH
+        steps to let the numpy workers re-enter, and it keeps the same
+        busy_time / cycle_sleep duty cycle as the access workers.
+        """
+        i = 0
+        try:
+            with memoryview(chain) as links:
+                while not self._stop.is_set():
+                    deadline = time.perf_counter() + self.busy_time
+                    while time.perf_counter() < deadline:
+                        for _ in range(self.CHASE_BATCH):
+                            i = links[i]
+                        time.sleep(0)
+                    if self.cycle_sleep:
+                        self._stop.wait(self.cycle_sleep)
+            # Consume the final position so the chase cannot be optimized away.
+            self._chase_pos = i
+        except Exception as e:
+            print(f"Error in chase worker: {e}")
+
     def _static_worker(self):
         """Low-CPU keep-resident loop: one strided touch every few seconds."""
         idx = 0
@@ -239,12 +367,44 @@ class Jaws:
             return
 
         num_threads = max(1, min(self.intensity, os.cpu_count() or 1))
+        # The chase needs a buffer of its own (RMW would corrupt its links) and
+        # must leave at least one thread and one buffer to the RMW workers.
+        chase = (
+            self.intensity >= self.CHASE_MIN_INTENSITY
+            and num_threads >= 2
+            and len(self.buffers) >= 2
+        )
+        chase_buf = max(self.buffers, key=lambda b: b.nbytes) if chase else None
+        if chase and chase_buf.nbytes < self.CHASE_MIN_BYTES:
+            print(
+                f"Warning: largest chunk is {chase_buf.nbytes / (1024 * 1024):.2f} MB, "
+                f"below {self.CHASE_MIN_BYTES // (1024 * 1024)} MB, so a pointer "
+                "chase would mostly hit CPU cache; skipping it. Use a larger --chunk."
+            )
+            chase = False
+        if chase:
+            rmw_buffers = [b for b in self.buffers if b is not chase_buf]
+        else:
+            rmw_buffers = self.buffers
+        num_rmw = num_threads - 1 if chase else num_threads
         print(
-            f"Starting {num_threads} vectorized access thread(s) "
+            f"Starting {num_rmw} vectorized access thread(s) "
             f"(intensity {self.intensity}/10)..."
         )
-        for wid in range(num_threads):
-            t = threading.Thread(target=self._access_worker, args=(wid,), daemon=True)
+        for wid in range(num_rmw):
+            t = threading.Thread(
+                target=self._access_worker, args=(wid, rmw_buffers), daemon=True
+            )
+            t.start()
+            self.threads.append(t)
+
+        if chase:
+            chain = self._build_chain(chase_buf)
+            print(
+                f"Starting 1 pointer-chase latency thread over "
+                f"{chase_buf.nbytes / (1024 * 1024):.2f} MB..."
+            )
+            t = threading.Thread(target=self._chase_worker, args=(chain,), daemon=True)
             t.start()
             self.threads.append(t)
 
@@ -262,6 +422,18 @@ class Jaws:
             pass
         return None
 
+    @staticmethod
+    def _anon_huge_kb():
+        """Return this process's AnonHugePages in KB, or None if unavailable."""
+        try:
+            with open("/proc/self/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("AnonHugePages:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
+
     def residency_check(self):
         """Report residency, and never let '0 swapped' imply 'cannot be swapped'.
 
@@ -291,7 +463,7 @@ class Jaws:
             )
 
     def report_utilization(self):
-        rss = psutil.Process(os.getpid()).memory_info().rss
+        rss = self._proc.memory_info().rss
         print(
             f"JAWS RSS: {rss / (1024 * 1024):.2f} MB / "
             f"requested {self.target_bytes / (1024 * 1024):.2f} MB "
@@ -299,10 +471,9 @@ class Jaws:
         )
 
     def _monitor_loop(self):
-        proc = psutil.Process(os.getpid())
         while not self._stop.is_set():
-            rss = proc.memory_info().rss
-            cpu = proc.cpu_percent(interval=1.0)
+            rss = self._proc.memory_info().rss
+            cpu = self._proc.cpu_percent(interval=1.0)
             mode = "static" if self.static_mode else f"intensity {self.intensity}/10"
             print(f"Memory: {rss / (1024 * 1024):.2f} MB, CPU: {cpu:.1f}%, {mode}")
             self._stop.wait(4.0)
@@ -354,10 +525,9 @@ class Jaws:
 
 def parse_chunk_size(chunk_str):
     """Parse a chunk size like '100', '100MB', '1GB', '512KB' into MB."""
-    import re
     if not chunk_str:
         return 100
-    match = re.match(r"^\s*(\d+)\s*([KMG]B?)?\s*$", chunk_str, re.IGNORECASE)
+    match = _CHUNK_RE.match(chunk_str)
     if not match:
         raise ValueError(f"Invalid chunk size format: {chunk_str}")
     value, unit = match.groups()
@@ -390,6 +560,9 @@ def build_parser():
     parser.add_argument("--intensity", type=int, default=5, choices=range(1, 11),
                         metavar="1-10",
                         help="Access intensity 1-10 (default: 5)")
+    parser.add_argument("--no-hugepages", dest="hugepages", action="store_false",
+                        help="Keep buffers on base pages: stop numpy advising\n"
+                             "transparent huge pages (MADV_HUGEPAGE)")
     parser.add_argument("--version", action="version", version="JAWS 2.0.0")
     return parser
 
@@ -426,7 +599,8 @@ def main():
         f"intensity {args.intensity}/10 | mode {'static' if args.static else 'dynamic'}"
     )
 
-    Jaws(percentage, args.static, chunk_size_mb, args.intensity).run()
+    Jaws(percentage, args.static, chunk_size_mb, args.intensity,
+         hugepages=args.hugepages).run()
 
 
 if __name__ == "__main__":